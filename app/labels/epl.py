@@ -1,48 +1,73 @@
 """EPL label template generation."""
-from typing import Dict, Optional
+import functools
+from typing import Callable, Dict, Optional
 
-from app.labels.sizes import get_label_size_dots
-from app.utils.validation import compute_upc_check_digit
+from app.labels.sizes import DEFAULT_DIMS, LABEL_SIZES_DOTS
+from app.labels.text import truncate_text, wrap_text
+from app.utils.validation import compute_upc_check_digit, digits_only
 from app.utils.settings import LabelSettings
 
-
-def _e(line: str) -> str:
-    return line + "\r\n"
-
-
-def truncate_text(text: str, max_chars: int) -> str:
-    if text is None:
-        return ""
-    if len(text) <= max_chars:
-        return text
-    return text[: max_chars - 1] + "…"
-
-
-def wrap_text(text: str, max_chars: int, max_lines: int = 2) -> list[str]:
-    """Wrap text to multiple lines if needed."""
-    if not text:
-        return [""]
-    if len(text) <= max_chars:
-        return [text]
-    
-    words = text.split()
-    lines = []
-    current_line = ""
-    
-    for word in words:
-        if len(current_line + " " + word) <= max_chars:
-            current_line += (" " + word) if current_line else word
-        else:
-            if current_line:
-                lines.append(current_line)
-            current_line = word
-    
-    if current_line:
-        lines.append(current_line)
-    
-    return lines[:max_lines]  # Respect max_lines parameter
-
-
+# Renders (item_number, upc12, title, casepack, copies) into an EPL payload
+EplTemplate = Callable[[str, str, str, str, int], bytes]
+
+# Layouts used when no settings are supplied; unknown sizes use 4x6.
+# Every field the template reads is spelled out, so changing a
+# LabelSettings default never changes fallback EPL output.
+_FALLBACK_LAYOUTS: Dict[str, LabelSettings] = {
+    "2x1": LabelSettings(
+        title_font=4,
+        text_font=3,
+        title_xy_mul_x=1,
+        title_xy_mul_y=3,
+        x_margin=20,
+        title_y=6,
+        item_y=32,
+        case_y=52,
+        barcode_y=72,
+        line_spacing=24,
+        title_max_chars=24,
+        item_max_chars=36,
+        case_max_chars=36,
+        max_title_lines=2,
+        show_separator=True,
+        separator_width=200,
+        separator_thickness=2,
+        barcode_height=40,
+        barcode_narrow=3,
+        barcode_wide=6,
+        barcode_hri="B",
+    ),
+    "4x6": LabelSettings(
+        title_font=4,
+        text_font=3,
+        title_xy_mul_x=1,
+        title_xy_mul_y=4,
+        x_margin=40,
+        title_y=40,
+        item_y=110,
+        case_y=160,
+        barcode_y=210,
+        line_spacing=24,
+        title_max_chars=24,
+        item_max_chars=36,
+        case_max_chars=36,
+        max_title_lines=2,
+        show_separator=True,
+        separator_width=200,
+        separator_thickness=2,
+        barcode_height=280,
+        barcode_narrow=3,
+        barcode_wide=6,
+        barcode_hri="B",
+    ),
+}
+
+
+def _ascii(text: str) -> bytes:
+    return text.encode("ascii", errors="ignore")
+
+
+@functools.lru_cache(maxsize=128)
 def build_epl_label(
     *,
     size_key: str,
@@ -54,136 +79,107 @@ def build_epl_label(
     settings: Optional[LabelSettings] = None,
 ) -> bytes:
     """Build an EPL label for the given fields and size."""
-    dims = get_label_size_dots(size_key)
-    width = dims["width_dots"]
-    height = dims["height_dots"]
-
-    # Use provided settings or defaults
-    if settings:
-        title_font = settings.title_font
-        title_xy_mul = (settings.title_xy_mul_x, settings.title_xy_mul_y)
-        text_font = settings.text_font
-        text_xy_mul = (1, 1)  # Fixed for text
-        narrow = settings.barcode_narrow
-        wide = settings.barcode_wide
-        barcode_height = settings.barcode_height
-        title_y = settings.title_y
-        item_y = settings.item_y
-        case_y = settings.case_y
-        barcode_y = settings.barcode_y
-        x_margin = settings.x_margin
-        hri = settings.barcode_hri
-        line_spacing = settings.line_spacing
-        title_max_chars = settings.title_max_chars
-        item_max_chars = settings.item_max_chars
-        case_max_chars = settings.case_max_chars
-        max_title_lines = settings.max_title_lines
-        show_separator = settings.show_separator
-        separator_width = settings.separator_width
-        separator_thickness = settings.separator_thickness
-    else:
-        # Default settings (fallback)
-        if size_key == "2x1":
-            title_font = 4
-            title_xy_mul = (1, 3)
-            text_font = 3
-            text_xy_mul = (1, 1)
-            narrow = 3
-            wide = 6
-            barcode_height = 40
-            title_y = 6
-            item_y = 32
-            case_y = 52
-            barcode_y = 72
-            x_margin = 20
-            hri = "B"
-            line_spacing = 24
-            title_max_chars = 24
-            item_max_chars = 36
-            case_max_chars = 36
-            max_title_lines = 2
-            show_separator = True
-            separator_width = 200
-            separator_thickness = 2
+    template = _compile_epl_template(size_key, settings)
+    return template(item_number, upc12, title, casepack, copies)
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_epl_template(size_key: str, settings: Optional[LabelSettings]) -> EplTemplate:
+    """Resolve the layout for a size/settings pair into a label renderer.
+
+    Everything that does not depend on the label fields is formatted once
+    here, so rendering a label only substitutes the variable text. Cached
+    per (size, settings) pair.
+    """
+    width, height = LABEL_SIZES_DOTS.get(size_key, DEFAULT_DIMS)
+
+    # Use provided settings or the per-size fallback layout
+    layout = settings or _FALLBACK_LAYOUTS.get(size_key, _FALLBACK_LAYOUTS["4x6"])
+    x_margin = layout.x_margin
+    title_y = layout.title_y
+    item_y = layout.item_y
+    case_y = layout.case_y
+    barcode_y = layout.barcode_y
+    line_spacing = layout.line_spacing
+    title_max_chars = layout.title_max_chars
+    item_max_chars = layout.item_max_chars
+    case_max_chars = layout.case_max_chars
+    max_title_lines = layout.max_title_lines
+    show_separator = layout.show_separator
+
+    # Fixed fragments are encoded once; only the field values are encoded per label
+    header = _ascii(f"N\r\nq{width}\r\nQ{height},24\r\n")
+    title_fmt = _ascii(
+        f"A{x_margin},%d,0,{layout.title_font},{layout.title_xy_mul_x},{layout.title_xy_mul_y},N,\"%s\"\r\n"
+    )
+    # Text is never scaled (1,1)
+    text_fmt = _ascii(f"A{x_margin},%d,0,{layout.text_font},1,1,N,\"%s\"\r\n")
+    case_fmt = _ascii(f"A{x_margin},%d,0,{layout.text_font},1,1,N,\"CS/PK: %s\"\r\n")
+    separator_fmt = _ascii(
+        f"L{x_margin},%d,{x_margin + layout.separator_width},%d,{layout.separator_thickness}\r\n"
+    )
+    # Code 128 (1) for better LP2844 compatibility
+    barcode_fmt = _ascii(
+        f"B{x_margin},%d,0,1,{layout.barcode_narrow},{layout.barcode_wide},"
+        f"{layout.barcode_height},{layout.barcode_hri},\"%s\"\r\n"
+    )
+
+    # Helpers are bound as defaults so the per-label path uses fast local lookups
+    def render(
+        item_number: str,
+        upc12: str,
+        title: str,
+        casepack: str,
+        copies: int,
+        _len=len,
+        _truncate=truncate_text,
+        _wrap=wrap_text,
+        _digits_only=digits_only,
+        _check_digit=compute_upc_check_digit,
+        _ascii=_ascii,
+    ) -> bytes:
+        # Truncate/sanitize text for EPL ASCII
+        safe_title = _truncate(title, title_max_chars)
+        safe_item = _truncate(item_number, item_max_chars)
+        safe_case = _truncate(casepack, case_max_chars)
+
+        # Wrap title to multiple lines if needed
+        title_lines = _wrap(safe_title, title_max_chars, max_title_lines)
+        n_title_lines = _len(title_lines)
+
+        # Ensure 12-digit UPC-A data (compute if only 11 provided)
+        digits = _digits_only(upc12 or "")
+        n_digits = _len(digits)
+        if n_digits >= 12:
+            upc_payload = digits[:12]
+        elif n_digits == 11:
+            upc_payload = digits + _check_digit(digits)
         else:
-            title_font = 4
-            title_xy_mul = (1, 4)
-            text_font = 3
-            text_xy_mul = (1, 1)
-            narrow = 3
-            wide = 6
-            barcode_height = 280
-            title_y = 40
-            item_y = 110
-            case_y = 160
-            barcode_y = 210
-            x_margin = 40
-            hri = "B"
-            line_spacing = 24
-            title_max_chars = 24
-            item_max_chars = 36
-            case_max_chars = 36
-            max_title_lines = 2
-            show_separator = True
-            separator_width = 200
-            separator_thickness = 2
-
-    # Truncate/sanitize text for EPL ASCII
-    safe_title = truncate_text(title or "", title_max_chars)
-    safe_item = truncate_text(item_number or "", item_max_chars)
-    safe_case = truncate_text(casepack or "", case_max_chars)
-    
-    # Wrap title to multiple lines if needed
-    title_lines = wrap_text(safe_title, title_max_chars, max_title_lines)
-
-    # Ensure 12-digit UPC-A data (compute if only 11 provided)
-    digits = "".join(ch for ch in (upc12 or "") if ch.isdigit())
-    if len(digits) >= 12:
-        upc_payload = digits[:12]
-    elif len(digits) == 11:
-        upc_payload = digits + compute_upc_check_digit(digits)
-    else:
-        upc_payload = digits
-
-    lines = []
-    lines.append(_e("N"))
-    lines.append(_e(f"q{width}"))
-    lines.append(_e(f"Q{height},24"))
-
-    # Title / fields (multi-line title support)
-    for i, title_line in enumerate(title_lines):
-        y_pos = title_y + (i * line_spacing)
-        lines.append(_e(f"A{x_margin},{y_pos},0,{title_font},{title_xy_mul[0]},{title_xy_mul[1]},N,\"{title_line}\""))
-    
-    # Add separator line after title (if enabled)
-    if show_separator and title_lines and title_lines[0]:
-        separator_y = title_y + (len(title_lines) * line_spacing) + line_spacing
-        lines.append(_e(f"L{x_margin},{separator_y},{x_margin + separator_width},{separator_y},{separator_thickness}"))
-    
-    # Adjust item position if title is multi-line
-    item_y_adjusted = item_y + (len(title_lines) - 1) * line_spacing
-    if show_separator and title_lines and title_lines[0]:
-        item_y_adjusted += line_spacing  # Extra space after separator
-    lines.append(_e(f"A{x_margin},{item_y_adjusted},0,{text_font},{text_xy_mul[0]},{text_xy_mul[1]},N,\"{safe_item}\""))
-    
-    if safe_case:
-        case_y_adjusted = case_y + (len(title_lines) - 1) * line_spacing
-        if show_separator and title_lines and title_lines[0]:
-            case_y_adjusted += line_spacing  # Extra space after separator
-        lines.append(_e(f"A{x_margin},{case_y_adjusted},0,{text_font},{text_xy_mul[0]},{text_xy_mul[1]},N,\"CS/PK: {safe_case}\""))
+            upc_payload = digits
 
-    # Code 128 barcode (only if UPC provided) - back to Code 128 for LP2844 compatibility
-    if upc_payload and len(upc_payload) >= 11:
-        barcode_y_adjusted = barcode_y + (len(title_lines) - 1) * line_spacing
+        buf = bytearray(header)
+
+        # Title / fields (multi-line title support)
+        for i, title_line in enumerate(title_lines):
+            buf += title_fmt % (title_y + (i * line_spacing), _ascii(title_line))
+
+        # Fields below the title shift down for each extra title line and the separator
+        y_shift = (n_title_lines - 1) * line_spacing
         if show_separator and title_lines and title_lines[0]:
-            barcode_y_adjusted += line_spacing  # Extra space after separator
-        # Use Code 128 (1) for better LP2844 compatibility
-        lines.append(_e(f"B{x_margin},{barcode_y_adjusted},0,1,{narrow},{wide},{barcode_height},{hri},\"{upc_payload}\""))
+            separator_y = title_y + (n_title_lines * line_spacing) + line_spacing
+            buf += separator_fmt % (separator_y, separator_y)
+            y_shift += line_spacing  # Extra space after separator
+
+        buf += text_fmt % (item_y + y_shift, _ascii(safe_item))
+        if safe_case:
+            buf += case_fmt % (case_y + y_shift, _ascii(safe_case))
+
+        # Code 128 barcode (only if UPC provided)
+        if n_digits >= 11:
+            buf += barcode_fmt % (barcode_y + y_shift, upc_payload.encode("ascii"))
 
-    if copies and copies > 1:
-        lines.append(_e(f"P{copies}"))
-    else:
-        lines.append(_e("P1"))
+        buf += b"P%d\r\n" % (copies if copies and copies > 1 else 1)
+        # Templates feed the builder's lru_cache, so hand back an immutable copy
+        return bytes(buf)
 
-    data = "".join(lines)
-    return data.encode("ascii", errors="ignore")
+    return render
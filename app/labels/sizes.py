@@ -1,18 +1,22 @@
 """Label size utilities in 203 dpi dots."""
 
-from typing import Dict
+from types import MappingProxyType
+from typing import Mapping, Tuple
 
-LABEL_SIZES_DOTS: Dict[str, Dict[str, int]] = {
-    "2x1": {"width_dots": 203 * 2, "height_dots": 203 * 1},
-    "4x6": {"width_dots": 203 * 4, "height_dots": 203 * 6},
-}
+# (width_dots, height_dots) at 203 dpi
+LABEL_SIZES_DOTS: Mapping[str, Tuple[int, int]] = MappingProxyType({
+    "2x1": (406, 203),
+    "4x6": (812, 1218),
+})
 
+LABEL_SIZE_KEYS: Tuple[str, ...] = tuple(LABEL_SIZES_DOTS)
 
-def get_label_size_dots(size_key: str) -> Dict[str, int]:
-    """Return width/height in dots for a given size key.
+DEFAULT_DIMS: Tuple[int, int] = LABEL_SIZES_DOTS["4x6"]
+
+
+def get_label_size_dots(size_key: str) -> Tuple[int, int]:
+    """Return (width, height) in dots for a given size key.
 
     Falls back to 4x6 if the key is unknown.
     """
-    if size_key in LABEL_SIZES_DOTS:
-        return LABEL_SIZES_DOTS[size_key]
-    return LABEL_SIZES_DOTS["4x6"]
+    return LABEL_SIZES_DOTS.get(size_key, DEFAULT_DIMS)
@@ -0,0 +1,38 @@
+"""Text fitting helpers shared by the label builders and the preview."""
+
+
+def truncate_text(text: str, max_chars: int) -> str:
+    """Cut text to max_chars, marking the cut with an ellipsis."""
+    if not text:
+        return ""
+    return text if len(text) <= max_chars else text[: max_chars - 1] + "…"
+
+
+def wrap_text(text: str, max_chars: int, max_lines: int = 2) -> list[str]:
+    """Wrap text to multiple lines if needed."""
+    if not text:
+        return [""]
+    if len(text) <= max_chars:
+        return [text]
+
+    # Track the running line length instead of building trial strings
+    lines = []
+    line_words: list[str] = []
+    line_len = 0
+    for word in text.split():
+        if line_words and line_len + 1 + len(word) <= max_chars:
+            line_words.append(word)
+            line_len += 1 + len(word)
+        else:
+            if line_words:
+                lines.append(" ".join(line_words))
+                if len(lines) >= max_lines:
+                    # Later words would only be cut off
+                    return lines[:max_lines]
+            line_words = [word]
+            line_len = len(word)
+
+    if line_words:
+        lines.append(" ".join(line_words))
+
+    return lines[:max_lines]  # Respect max_lines parameter
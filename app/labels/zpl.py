@@ -1,17 +1,31 @@
 """ZPL label template generation."""
-from typing import Dict
+import functools
+from typing import NamedTuple, Tuple
 
-from app.labels.sizes import get_label_size_dots
+from app.labels.sizes import DEFAULT_DIMS, LABEL_SIZES_DOTS
+from app.labels.text import truncate_text
 
 
-def truncate_text(text: str, max_chars: int) -> str:
-    if text is None:
-        return ""
-    if len(text) <= max_chars:
-        return text
-    return text[: max_chars - 1] + "…"
+class _ZplLayout(NamedTuple):
+    title_font: Tuple[int, int]
+    text_font: Tuple[int, int]
+    barcode_height: int
+    title_y: int
+    item_y: int
+    case_y: int
+    barcode_y: int
 
 
+# Typography per size; unknown sizes use 4x6
+_LAYOUTS = {
+    "2x1": _ZplLayout(title_font=(30, 30), text_font=(24, 24), barcode_height=80,
+                      title_y=10, item_y=50, case_y=80, barcode_y=110),
+    "4x6": _ZplLayout(title_font=(48, 48), text_font=(36, 36), barcode_height=300,
+                      title_y=40, item_y=110, case_y=160, barcode_y=220),
+}
+
+
+@functools.lru_cache(maxsize=128)
 def build_zpl_label(
     *,
     size_key: str,
@@ -25,54 +39,33 @@ def build_zpl_label(
 
     Uses a simple layout tuned for 203 dpi printers.
     """
-    dims = get_label_size_dots(size_key)
-    width = dims["width_dots"]
-    height = dims["height_dots"]
+    width, height = LABEL_SIZES_DOTS.get(size_key, DEFAULT_DIMS)
 
     # Basic typography per size
-    if size_key == "2x1":
-        title_font = (30, 30)
-        text_font = (24, 24)
-        barcode_height = 80
-        title_y = 10
-        item_y = 50
-        case_y = 80
-        barcode_y = 110
-    else:  # 4x6 default
-        title_font = (48, 48)
-        text_font = (36, 36)
-        barcode_height = 300
-        title_y = 40
-        item_y = 110
-        case_y = 160
-        barcode_y = 220
+    layout = _LAYOUTS.get(size_key, _LAYOUTS["4x6"])
+    title_font = layout.title_font
+    text_font = layout.text_font
 
-    safe_title = truncate_text(title or "", 36)
-    safe_item = truncate_text(item_number or "", 36)
-    safe_case = truncate_text(casepack or "", 36)
-
-    zpl = []
-    zpl.append("^XA")
-    zpl.append(f"^PW{width}")
-    zpl.append(f"^LL{height}")
-    zpl.append("^LH0,0")
-    zpl.append("^CI28")
+    safe_title = truncate_text(title, 36)
+    safe_item = truncate_text(item_number, 36)
+    safe_case = truncate_text(casepack, 36)
 
+    buf = bytearray(b"^XA^PW%d^LL%d^LH0,0^CI28" % (width, height))
     # Title
-    zpl.append(f"^FO20,{title_y}^A0N,{title_font[0]},{title_font[1]}^FD{safe_title}^FS")
+    buf += b"^FO20,%d^A0N,%d,%d^FD" % (layout.title_y, title_font[0], title_font[1])
+    buf += safe_title.encode("utf-8")
     # Item
-    zpl.append(f"^FO20,{item_y}^A0N,{text_font[0]},{text_font[1]}^FDItem: {safe_item}^FS")
+    buf += b"^FS^FO20,%d^A0N,%d,%d^FDItem: " % (layout.item_y, text_font[0], text_font[1])
+    buf += safe_item.encode("utf-8")
     # Casepack
-    zpl.append(f"^FO20,{case_y}^A0N,{text_font[0]},{text_font[1]}^FDCasepack: {safe_case}^FS")
-
+    buf += b"^FS^FO20,%d^A0N,%d,%d^FDCasepack: " % (layout.case_y, text_font[0], text_font[1])
+    buf += safe_case.encode("utf-8")
     # Barcode defaults and UPC-A (^BU)
-    zpl.append("^BY2,2,10")
-    zpl.append(f"^FO20,{barcode_y}^BUN,{barcode_height},Y,N^FD{upc12}^FS")
-
+    buf += b"^FS^BY2,2,10^FO20,%d^BUN,%d,Y,N^FD" % (layout.barcode_y, layout.barcode_height)
+    buf += (upc12 or "").encode("utf-8")
+    buf += b"^FS"
     if copies and copies > 1:
-        zpl.append(f"^PQ{copies}")
-
-    zpl.append("^XZ")
-
-    data = "".join(zpl)
-    return data.encode("utf-8")
+        buf += b"^PQ%d" % copies
+    buf += b"^XZ"
+    # Results are shared through the lru_cache, so return immutable bytes
+    return bytes(buf)
@@ -1,6 +1,9 @@
 """Main entry for the PrintLabel Windows app (Tkinter UI)."""
 import logging
 import os
+import sys
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Optional
 import tkinter as tk
 from tkinter import ttk, messagebox
@@ -9,12 +12,27 @@ from app.utils.winprint import list_installed_printers, get_default_printer, sen
 from app.printer_detection import guess_printer_language
 from app.labels.zpl import build_zpl_label
 from app.labels.epl import build_epl_label
-from app.labels.sizes import LABEL_SIZES_DOTS
+from app.labels.sizes import DEFAULT_DIMS, LABEL_SIZE_KEYS, LABEL_SIZES_DOTS
 from app.utils.validation import ensure_upc12, sanitize_text
-from app.utils.preview import render_label_preview, image_to_tk
 from app.utils.database import LabelDatabase
 from app.utils.settings import SettingsManager
 
+# How often the Tk thread checks whether a background preview render is done
+_PREVIEW_POLL_MS = 15
+# How often the Tk thread checks whether a background print job is done
+_PRINT_POLL_MS = 50
+# Idle time after a fast (NEAREST) preview before it is redrawn with LANCZOS
+_PREVIEW_REFINE_MS = 500
+# Number of finished preview images kept for instant redisplay
+_PREVIEW_CACHE_SIZE = 8
+# Preview canvas size in pixels (the window is not resizable)
+_PREVIEW_CANVAS_W = 520
+_PREVIEW_CANVAS_H = 260
+# Printer language choices offered in the UI
+_LANGUAGES = ("Auto", "ZPL", "EPL")
+# Set PRINTLABEL_DEBUG_PAYLOAD=1 to dump each print payload into logs/
+_DEBUG_PAYLOADS = os.environ.get("PRINTLABEL_DEBUG_PAYLOAD") == "1"
+
 
 def setup_logging() -> None:
     os.makedirs("logs", exist_ok=True)
@@ -25,6 +43,51 @@ def setup_logging() -> None:
     )
 
 
+def _write_payload_debug(path: str, payload: bytes) -> None:
+    """Dump a print payload for troubleshooting (runs on the print worker)."""
+    try:
+        with open(path, "wb") as f:
+            f.write(payload)
+    except Exception:
+        logging.warning("Failed to write payload debug file", exc_info=True)
+
+
+def _send_label(printer_name: str, lang: str, settings, **fields) -> None:
+    """Build the label payload and spool it (runs on the print worker)."""
+    if lang == "EPL":
+        payload = build_epl_label(settings=settings, **fields)
+    else:
+        payload = build_zpl_label(**fields)
+
+    # Write debug payload to logs for troubleshooting
+    if _DEBUG_PAYLOADS:
+        _write_payload_debug(os.path.join("logs", f"payload_{lang.lower()}.txt"), payload)
+
+    logging.info("Sending %s job to %s (%d bytes)", lang, printer_name, len(payload))
+    send_raw(printer_name, payload, job_name=f"PrintLabel ({lang})")
+
+
+def _render_scaled_preview(cnv_w: int, cnv_h: int, final: bool, **fields):
+    """Render a label preview scaled to fit the canvas (runs on a worker thread).
+
+    Final renders resize with LANCZOS, interactive ones with NEAREST.
+    """
+    # Imported here so Pillow and python-barcode load on the worker, not at startup
+    from PIL import Image
+    from app.utils.preview import render_label_preview
+
+    img = render_label_preview(**fields)
+
+    # Scale to fit canvas while preserving aspect
+    scale = min(cnv_w / img.width, cnv_h / img.height)
+    if scale <= 0:
+        scale = 1.0
+    new_size = (int(img.width * scale), int(img.height * scale))
+    if new_size == img.size:
+        return img
+    return img.resize(new_size, Image.LANCZOS if final else Image.NEAREST)
+
+
 class PrintLabelApp(tk.Tk):
     def __init__(self) -> None:
         super().__init__()
@@ -32,17 +95,36 @@ class PrintLabelApp(tk.Tk):
         self.geometry("560x900")
         self.resizable(False, False)
 
-        setup_logging()
         logging.info("Application started")
 
         self.preview_image = None
+        self._preview_job = None
+        self._refine_job = None
+        self._preview_future: Optional[Future] = None
+        self._last_preview_key = None
+        self._last_preview_fields: dict = {}
+        # Set when a refresh was skipped because the window was not shown
+        self._preview_dirty = False
+        # Recently shown previews, most recent last
+        self._preview_cache: "OrderedDict[tuple, object]" = OrderedDict()
+        # PhotoImage reused for fast interactive previews
+        self._draft_photo = None
+        # Tk is not thread-safe: the worker only renders PIL images, and
+        # the Tk thread polls for the result to put it on the canvas.
+        self._preview_executor = ThreadPoolExecutor(max_workers=1)
+        # Print jobs run one at a time off the Tk thread; results are polled the same way
+        self._print_executor = ThreadPoolExecutor(max_workers=1)
         self.db = LabelDatabase()
+        # (row, display text) for the saved items listbox, in listbox order
+        self._saved_items: list = []
         self.settings_manager = SettingsManager()
 
         self._build_ui()
         self._load_printers()
         self._load_saved_settings()
+        # Deferred until the window is mapped (see _on_map)
         self._update_preview()
+        self.bind("<Map>", self._on_map)
 
     def _build_ui(self) -> None:
         padding = {"padx": 10, "pady": 6}
@@ -54,43 +136,47 @@ class PrintLabelApp(tk.Tk):
         ttk.Label(frm_printer, text="Installed:").grid(row=0, column=0, sticky="w")
         self.cbo_printers = ttk.Combobox(frm_printer, state="readonly", width=50)
         self.cbo_printers.grid(row=0, column=1, columnspan=3, sticky="we", padx=6)
-        self.cbo_printers.bind("<<ComboboxSelected>>", lambda e: self._update_preview())
+        self.cbo_printers.bind("<<ComboboxSelected>>", lambda e: self._schedule_preview())
 
         ttk.Label(frm_printer, text="Language:").grid(row=1, column=0, sticky="w")
-        self.cbo_language = ttk.Combobox(frm_printer, state="readonly", values=["Auto", "ZPL", "EPL"], width=12)
+        self.cbo_language = ttk.Combobox(frm_printer, state="readonly", values=_LANGUAGES, width=12)
         self.cbo_language.set("Auto")
         self.cbo_language.grid(row=1, column=1, sticky="w", padx=6)
-        self.cbo_language.bind("<<ComboboxSelected>>", lambda e: self._update_preview())
+        self.cbo_language.bind("<<ComboboxSelected>>", lambda e: self._schedule_preview())
 
         ttk.Label(frm_printer, text="Size:").grid(row=1, column=2, sticky="e")
-        self.cbo_size = ttk.Combobox(frm_printer, state="readonly", values=list(LABEL_SIZES_DOTS.keys()), width=12)
+        self.cbo_size = ttk.Combobox(frm_printer, state="readonly", values=LABEL_SIZE_KEYS, width=12)
         self.cbo_size.set("4x6")
         self.cbo_size.grid(row=1, column=3, sticky="w")
-        self.cbo_size.bind("<<ComboboxSelected>>", lambda e: self._update_preview())
+        self.cbo_size.bind("<<ComboboxSelected>>", lambda e: self._schedule_preview())
 
         # Fields
         frm_fields = ttk.LabelFrame(self, text="Label Data")
         frm_fields.pack(fill="x", **padding)
 
         ttk.Label(frm_fields, text="Item Number:").grid(row=0, column=0, sticky="e")
-        self.txt_item = ttk.Entry(frm_fields, width=50)
+        self.var_item = tk.StringVar(self)
+        self.txt_item = ttk.Entry(frm_fields, width=50, textvariable=self.var_item)
         self.txt_item.grid(row=0, column=1, sticky="we", padx=6)
-        self.txt_item.bind("<KeyRelease>", lambda e: self._update_preview())
+        self.txt_item.bind("<KeyRelease>", lambda e: self._schedule_preview())
 
         ttk.Label(frm_fields, text="UPC (11 or 12 digits):").grid(row=1, column=0, sticky="e")
-        self.txt_upc = ttk.Entry(frm_fields, width=50)
+        self.var_upc = tk.StringVar(self)
+        self.txt_upc = ttk.Entry(frm_fields, width=50, textvariable=self.var_upc)
         self.txt_upc.grid(row=1, column=1, sticky="we", padx=6)
-        self.txt_upc.bind("<KeyRelease>", lambda e: self._update_preview())
+        self.txt_upc.bind("<KeyRelease>", lambda e: self._schedule_preview())
 
         ttk.Label(frm_fields, text="Title:").grid(row=2, column=0, sticky="e")
-        self.txt_title = ttk.Entry(frm_fields, width=50)
+        self.var_title = tk.StringVar(self)
+        self.txt_title = ttk.Entry(frm_fields, width=50, textvariable=self.var_title)
         self.txt_title.grid(row=2, column=1, sticky="we", padx=6)
-        self.txt_title.bind("<KeyRelease>", lambda e: self._update_preview())
+        self.txt_title.bind("<KeyRelease>", lambda e: self._schedule_preview())
 
         ttk.Label(frm_fields, text="Casepack:").grid(row=3, column=0, sticky="e")
-        self.txt_case = ttk.Entry(frm_fields, width=50)
+        self.var_case = tk.StringVar(self)
+        self.txt_case = ttk.Entry(frm_fields, width=50, textvariable=self.var_case)
         self.txt_case.grid(row=3, column=1, sticky="we", padx=6)
-        self.txt_case.bind("<KeyRelease>", lambda e: self._update_preview())
+        self.txt_case.bind("<KeyRelease>", lambda e: self._schedule_preview())
 
         ttk.Label(frm_fields, text="Copies:").grid(row=4, column=0, sticky="e")
         self.spn_copies = tk.Spinbox(frm_fields, from_=1, to=999, width=6)
@@ -123,8 +209,12 @@ class PrintLabelApp(tk.Tk):
         # Preview area
         frm_preview = ttk.LabelFrame(self, text="Preview")
         frm_preview.pack(fill="both", expand=True, **padding)
-        self.cnv_preview = tk.Canvas(frm_preview, width=520, height=260, bg="white")
+        self.cnv_preview = tk.Canvas(frm_preview, width=_PREVIEW_CANVAS_W, height=_PREVIEW_CANVAS_H, bg="white")
         self.cnv_preview.pack(fill="both", expand=True)
+        self._cnv_w = _PREVIEW_CANVAS_W
+        self._cnv_h = _PREVIEW_CANVAS_H
+        # Single image item; each preview update just swaps its image
+        self._preview_item = self.cnv_preview.create_image(self._cnv_w // 2, self._cnv_h // 2)
 
         # Actions
         frm_actions = ttk.Frame(self)
@@ -158,9 +248,9 @@ class PrintLabelApp(tk.Tk):
         if settings:
             if settings["printer_name"] in self.cbo_printers["values"]:
                 self.cbo_printers.set(settings["printer_name"])
-            if settings["language"] in ["Auto", "ZPL", "EPL"]:
+            if settings["language"] in _LANGUAGES:
                 self.cbo_language.set(settings["language"])
-            if settings["size"] in list(LABEL_SIZES_DOTS.keys()):
+            if settings["size"] in LABEL_SIZES_DOTS:
                 self.cbo_size.set(settings["size"])
         
         # Load saved items
@@ -169,23 +259,31 @@ class PrintLabelApp(tk.Tk):
     def _refresh_saved_items(self):
         """Refresh the saved items listbox."""
         self.lst_saved.delete(0, tk.END)
-        items = self.db.get_saved_items()
-        for item in items:
-            display_text = f"{item['item_number']} - {item['title'][:30]}"
-            self.lst_saved.insert(tk.END, display_text)
+        self._saved_items = [
+            (item, f"{item['item_number']} - {item['title'][:30]}") for item in self.db.get_saved_items()
+        ]
+        if self._saved_items:
+            # One Tcl call for the whole list
+            self.lst_saved.insert(tk.END, *[display for _, display in self._saved_items])
+
+    def _read_fields(self) -> dict:
+        """Read all label fields from the form in one pass."""
+        return {
+            "item": self.var_item.get().strip(),
+            "upc": self.var_upc.get().strip(),
+            "title": self.var_title.get().strip(),
+            "case": self.var_case.get().strip(),
+        }
 
     def _save_current_item(self):
         """Save the current item to database."""
-        item_number = self.txt_item.get().strip()
+        fields = self._read_fields()
+        item_number = fields["item"]
         if not item_number:
             messagebox.showwarning("Save Item", "Please enter an item number to save.")
             return
         
-        upc = self.txt_upc.get().strip()
-        title = self.txt_title.get().strip()
-        casepack = self.txt_case.get().strip()
-        
-        if self.db.save_item(item_number, upc, title, casepack):
+        if self.db.save_item(item_number, fields["upc"], fields["title"], fields["case"]):
             messagebox.showinfo("Save Item", f"Item '{item_number}' saved successfully!")
             self._refresh_saved_items()
         else:
@@ -198,18 +296,14 @@ class PrintLabelApp(tk.Tk):
             messagebox.showwarning("Edit Item", "Please select an item to edit.")
             return
         
-        items = self.db.get_saved_items()
+        items = self._saved_items
         if selection[0] < len(items):
-            item = items[selection[0]]
+            item = items[selection[0]][0]
             # Load item into form for editing
-            self.txt_item.delete(0, tk.END)
-            self.txt_item.insert(0, item['item_number'])
-            self.txt_upc.delete(0, tk.END)
-            self.txt_upc.insert(0, item['upc'])
-            self.txt_title.delete(0, tk.END)
-            self.txt_title.insert(0, item['title'])
-            self.txt_case.delete(0, tk.END)
-            self.txt_case.insert(0, item['casepack'])
+            self.var_item.set(item['item_number'])
+            self.var_upc.set(item['upc'])
+            self.var_title.set(item['title'])
+            self.var_case.set(item['casepack'])
             self._update_preview()
             
             # Change save button to update mode
@@ -225,17 +319,13 @@ class PrintLabelApp(tk.Tk):
             messagebox.showwarning("Update Item", "No item selected for editing.")
             return
         
-        item_number = self.txt_item.get().strip()
+        fields = self._read_fields()
+        item_number = fields["item"]
         if not item_number:
             messagebox.showwarning("Update Item", "Please enter an item number.")
             return
         
-        upc = self.txt_upc.get().strip()
-        title = self.txt_title.get().strip()
-        casepack = self.txt_case.get().strip()
-        
-        # Delete old item and save new one
-        if self.db.delete_item(self._editing_item) and self.db.save_item(item_number, upc, title, casepack):
+        if self.db.update_item(self._editing_item, item_number, fields["upc"], fields["title"], fields["case"]):
             messagebox.showinfo("Update Item", f"Item updated successfully!")
             self._refresh_saved_items()
             # Reset save button
@@ -251,9 +341,9 @@ class PrintLabelApp(tk.Tk):
             messagebox.showwarning("Delete Item", "Please select an item to delete.")
             return
         
-        items = self.db.get_saved_items()
+        items = self._saved_items
         if selection[0] < len(items):
-            item = items[selection[0]]
+            item = items[selection[0]][0]
             if messagebox.askyesno("Delete Item", f"Delete item '{item['item_number']}'?"):
                 if self.db.delete_item(item['item_number']):
                     messagebox.showinfo("Delete Item", "Item deleted successfully!")
@@ -267,75 +357,154 @@ class PrintLabelApp(tk.Tk):
         if not selection:
             return
         
-        items = self.db.get_saved_items()
+        items = self._saved_items
         if selection[0] < len(items):
-            item = items[selection[0]]
-            self.txt_item.delete(0, tk.END)
-            self.txt_item.insert(0, item['item_number'])
-            self.txt_upc.delete(0, tk.END)
-            self.txt_upc.insert(0, item['upc'])
-            self.txt_title.delete(0, tk.END)
-            self.txt_title.insert(0, item['title'])
-            self.txt_case.delete(0, tk.END)
-            self.txt_case.insert(0, item['casepack'])
+            item = items[selection[0]][0]
+            self.var_item.set(item['item_number'])
+            self.var_upc.set(item['upc'])
+            self.var_title.set(item['title'])
+            self.var_case.set(item['casepack'])
             self._update_preview()
 
     def _resolve_language(self, printer_name: str) -> str:
-        selected = self.cbo_language.get()
+        selected = sys.intern(self.cbo_language.get())
         if selected == "Auto":
             return guess_printer_language(printer_name)
         return selected
 
-    def _update_preview(self) -> None:
+    def _schedule_preview(self) -> None:
+        """Coalesce a burst of edits into a single preview refresh."""
+        if self._preview_job is not None:
+            self.after_cancel(self._preview_job)
+        self._preview_job = self.after(150, self._update_preview, True)
+
+    def _update_preview(self, interactive: bool = False) -> None:
+        """Read the form and hand the preview render to the worker thread.
+
+        Interactive (typing) refreshes resize with NEAREST for speed; the
+        result is redrawn with LANCZOS once the form has been idle a moment.
+        """
+        if self._preview_job is not None:
+            # Called directly (or by the timer itself): a pending refresh is redundant
+            self.after_cancel(self._preview_job)
+            self._preview_job = None
+        if not self.winfo_viewable():
+            # Minimized or not mapped yet: render once the window is shown
+            self._preview_dirty = True
+            return
         try:
-            size_key = self.cbo_size.get() or "4x6"
-            dims = LABEL_SIZES_DOTS.get(size_key) or LABEL_SIZES_DOTS["4x6"]
+            size_key = sys.intern(self.cbo_size.get() or "4x6")
+            width_dots, height_dots = LABEL_SIZES_DOTS.get(size_key, DEFAULT_DIMS)
 
-            title = self.txt_title.get().strip()
-            item_number = self.txt_item.get().strip()
-            casepack = self.txt_case.get().strip()
-            upc12 = ensure_upc12(self.txt_upc.get().strip() or "") or ""
+            fields = self._read_fields()
+            title = fields["title"]
+            item_number = fields["item"]
+            casepack = fields["case"]
+            upc12 = ensure_upc12(fields["upc"]) or ""
 
             # Get current settings for preview
             printer_name = self.cbo_printers.get()
             settings = self.settings_manager.get_settings(printer_name, size_key) if printer_name else None
-            
-            img = render_label_preview(
-                width_dots=dims["width_dots"],
-                height_dots=dims["height_dots"],
+
+            # Nothing that affects the picture changed (e.g. arrow keys, copies)
+            preview_key = (size_key, title, item_number, casepack, upc12, settings)
+            if preview_key == self._last_preview_key:
+                return
+            self._last_preview_key = preview_key
+
+            # Only the newest render matters; drop one that has not started yet
+            if self._preview_future is not None:
+                self._preview_future.cancel()
+                self._preview_future = None
+            if self._refine_job is not None:
+                self.after_cancel(self._refine_job)
+                self._refine_job = None
+
+            cached = self._preview_cache.get(preview_key)
+            if cached is not None:
+                self._preview_cache.move_to_end(preview_key)
+                self._show_preview(cached)
+                return
+
+            self._last_preview_fields = dict(
+                width_dots=width_dots,
+                height_dots=height_dots,
                 title=title,
                 item_number=item_number,
                 casepack=casepack,
                 upc12=upc12,
                 settings=settings,
             )
+            self._submit_preview(preview_key, final=not interactive)
+        except Exception:
+            logging.warning("Failed to update preview", exc_info=True)
+
+    def _submit_preview(self, preview_key: tuple, final: bool) -> None:
+        """Start rendering the last read fields; final renders use LANCZOS."""
+        self._preview_future = self._preview_executor.submit(
+            _render_scaled_preview, self._cnv_w, self._cnv_h, final, **self._last_preview_fields
+        )
+        self.after(_PREVIEW_POLL_MS, self._install_preview, self._preview_future, preview_key, final)
+
+    def _refine_preview(self) -> None:
+        """Redraw the current fast preview at full quality."""
+        self._refine_job = None
+        if not self.winfo_viewable():
+            self._preview_dirty = True
+            self._last_preview_key = None  # force a full render on _on_map
+            return
+        self._submit_preview(self._last_preview_key, final=True)
 
-            # Scale to fit canvas while preserving aspect
-            cnv_w = int(self.cnv_preview["width"]) if str(self.cnv_preview["width"]).isdigit() else 520
-            cnv_h = int(self.cnv_preview["height"]) if str(self.cnv_preview["height"]).isdigit() else 260
-            scale = min(cnv_w / img.width, cnv_h / img.height)
-            if scale <= 0:
-                scale = 1.0
-            disp = img.resize((int(img.width * scale), int(img.height * scale)))
-            self.preview_image = image_to_tk(disp)
-            self.cnv_preview.delete("all")
-            self.cnv_preview.create_image(cnv_w // 2, cnv_h // 2, image=self.preview_image)
+    def _on_map(self, event) -> None:
+        """Catch up on a preview refresh skipped while the window was hidden."""
+        # The root's bindings also see <Map> from every child widget
+        if event.widget is self and self._preview_dirty:
+            self._preview_dirty = False
+            self._update_preview()
+
+    def _install_preview(self, future: Future, preview_key: tuple, final: bool) -> None:
+        """Show a finished render on the canvas (Tk thread only)."""
+        if future is not self._preview_future:
+            return  # superseded by a newer render
+        if not future.done():
+            self.after(_PREVIEW_POLL_MS, self._install_preview, future, preview_key, final)
+            return
+        try:
+            from app.utils.preview import image_to_tk  # already loaded by the worker
+
+            if final:
+                photo = image_to_tk(future.result())
+                # Only full-quality previews are worth keeping
+                self._preview_cache[preview_key] = photo
+                if len(self._preview_cache) > _PREVIEW_CACHE_SIZE:
+                    self._preview_cache.popitem(last=False)
+            else:
+                # Drafts are never cached, so one PhotoImage is reused for them
+                photo = self._draft_photo = image_to_tk(future.result(), self._draft_photo)
+                self._refine_job = self.after(_PREVIEW_REFINE_MS, self._refine_preview)
+            self._show_preview(photo)
         except Exception:
+            self._last_preview_key = None  # let the next edit retry
             logging.warning("Failed to update preview", exc_info=True)
 
+    def _show_preview(self, photo) -> None:
+        self.preview_image = photo
+        self.cnv_preview.itemconfig(self._preview_item, image=photo)
+
     def _on_print(self) -> None:
         printer_name = self.cbo_printers.get()
         if not printer_name:
             messagebox.showwarning("Printer", "Please select a printer.")
             return
 
-        size_key = self.cbo_size.get() or "4x6"
+        size_key = sys.intern(self.cbo_size.get() or "4x6")
 
-        item_number = sanitize_text(self.txt_item.get().strip(), 64)
-        title = sanitize_text(self.txt_title.get().strip(), 64)
-        casepack = sanitize_text(self.txt_case.get().strip(), 32)
+        fields = self._read_fields()
+        item_number = sanitize_text(fields["item"], 64)
+        title = sanitize_text(fields["title"], 64)
+        casepack = sanitize_text(fields["case"], 32)
 
-        upc_raw = self.txt_upc.get().strip()
+        upc_raw = fields["upc"]
         upc12 = ensure_upc12(upc_raw) if upc_raw else ""
         if upc_raw and not upc12:
             messagebox.showwarning("UPC", "UPC must be 11 or 12 digits with a valid check digit.")
@@ -353,43 +522,45 @@ class PrintLabelApp(tk.Tk):
         try:
             # Get current settings for printing
             settings = self.settings_manager.get_settings(printer_name, size_key)
-            
-            if lang == "EPL":
-                payload = build_epl_label(
-                    size_key=size_key,
-                    item_number=item_number,
-                    upc12=upc12,
-                    title=title,
-                    casepack=casepack,
-                    copies=copies,
-                    settings=settings,
-                )
-            else:
-                payload = build_zpl_label(
-                    size_key=size_key,
-                    item_number=item_number,
-                    upc12=upc12,
-                    title=title,
-                    casepack=casepack,
-                    copies=copies,
-                )
-
-            # Write debug payload to logs for troubleshooting
-            try:
-                fn = os.path.join("logs", f"payload_{lang.lower()}.txt")
-                with open(fn, "wb") as f:
-                    f.write(payload)
-            except Exception:
-                logging.warning("Failed to write payload debug file", exc_info=True)
-
-            logging.info("Sending %s job to %s (%d bytes)", lang, printer_name, len(payload))
-            send_raw(printer_name, payload, job_name=f"PrintLabel ({lang})")
+
+            # Building and spooling can be slow; keep the window responsive meanwhile
+            job = self._print_executor.submit(
+                _send_label,
+                printer_name,
+                lang,
+                settings,
+                size_key=size_key,
+                item_number=item_number,
+                upc12=upc12,
+                title=title,
+                casepack=casepack,
+                copies=copies,
+            )
+        except Exception as ex:
+            logging.exception("Failed to print")
+            messagebox.showerror("Error", f"Failed to print: {ex}")
+            return
+
+        self.btn_print.state(["disabled"])
+        # Remember the selections this job was sent with
+        job_settings = (printer_name, self.cbo_language.get(), size_key)
+        self.after(_PRINT_POLL_MS, self._finish_print, job, job_settings, lang, copies)
+
+    def _finish_print(self, job: Future, job_settings: tuple, lang: str, copies: int) -> None:
+        """Report a finished print job (Tk thread only)."""
+        if not job.done():
+            self.after(_PRINT_POLL_MS, self._finish_print, job, job_settings, lang, copies)
+            return
+        self.btn_print.state(["!disabled"])
+        printer_name = job_settings[0]
+        try:
+            job.result()
             messagebox.showinfo("Printed", f"Sent {copies} label(s) to {printer_name} ({lang}).")
             
             # Save printer settings after successful print
-            self.db.save_printer_settings(printer_name, self.cbo_language.get(), self.cbo_size.get())
+            self.db.save_printer_settings(*job_settings)
         except Exception as ex:
-            logging.exception("Failed to print")
+            logging.error("Failed to print", exc_info=ex)
             messagebox.showerror("Error", f"Failed to print: {ex}")
 
     def _open_settings(self):
@@ -426,5 +597,11 @@ class PrintLabelApp(tk.Tk):
 
 
 if __name__ == "__main__":
+    # Configure file logging before any widgets are built
+    setup_logging()
     app = PrintLabelApp()
     app.mainloop()
+    # Write settings still waiting on the save debounce
+    app.settings_manager.flush()
+    # Closing checkpoints the WAL and removes the -wal/-shm files
+    app.db.close()
@@ -1,6 +1,7 @@
 """Settings dialog for label configuration."""
 import tkinter as tk
 from tkinter import ttk, messagebox
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Callable, Optional
 import logging
 
@@ -10,6 +11,24 @@ from app.labels.sizes import get_label_size_dots
 
 logger = logging.getLogger(__name__)
 
+# Delay before re-rendering the preview after a setting changes
+_PREVIEW_DEBOUNCE_MS = 120
+# How often the Tk thread checks whether a background preview render is done
+_PREVIEW_POLL_MS = 15
+# How long the "defaults loaded" notice with its Undo button stays visible
+_UNDO_TOAST_MS = 5000
+
+# LabelSettings fields edited in the dialog; each has a "<field>_var" variable
+_EDITABLE_FIELDS = (
+    "title_font", "text_font", "title_xy_mul_y",
+    "x_margin", "title_y", "item_y", "case_y", "barcode_y", "line_spacing",
+    "title_max_chars", "item_max_chars", "case_max_chars", "max_title_lines",
+    "show_separator", "separator_width",
+    "barcode_height", "barcode_narrow", "barcode_wide", "barcode_hri",
+    "orientation",
+    "preview_title_font_size", "preview_text_font_size",
+)
+
 
 class SettingsDialog:
     """Dialog for configuring label settings with real-time preview."""
@@ -26,6 +45,17 @@ class SettingsDialog:
         # Get current settings
         self.current_settings = settings_manager.get_settings(printer_name, label_size)
         self.original_settings = self.current_settings
+        self._pending_preview = None
+        # True while _load_settings_to_widgets is writing the variables
+        self._loading = False
+        # Tk is not thread-safe: the worker only renders PIL images, and
+        # the Tk thread polls for the result to put it on the canvas.
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._preview_future: Optional[Future] = None
+        self._poll_job = None
+        # Widget values from before each reset, undoable while the notice is up
+        self._undo_stack: list[LabelSettings] = []
+        self._toast_job = None
         
         # Create dialog
         self.dialog = tk.Toplevel(parent)
@@ -42,7 +72,10 @@ class SettingsDialog:
         self.dialog.geometry(f"800x700+{x}+{y}")
         
         self._create_widgets()
-        self._update_preview()
+        self.dialog.bind("<Destroy>", self._on_destroy)
+        # Typed spinbox values don't fire the spinbox command
+        self.dialog.bind("<KeyRelease>", self._on_key_release)
+        self._do_update_preview()
     
     def _create_widgets(self):
         """Create the settings dialog widgets."""
@@ -88,6 +121,13 @@ class SettingsDialog:
                   command=self._apply).pack(side="left", padx=(0, 10))
         ttk.Button(button_frame, text="OK", 
                   command=self._ok).pack(side="left")
+        
+        # Shown for a few seconds after Reset to Default, offering to undo it
+        self._toast = ttk.Frame(main_frame)
+        self._toast.grid(row=3, column=0, columnspan=2, pady=(6, 0))
+        ttk.Label(self._toast, text="Defaults loaded (Apply to save).").pack(side="left", padx=(0, 10))
+        ttk.Button(self._toast, text="Undo", command=self._undo_reset).pack(side="left")
+        self._toast.grid_remove()
     
     def _create_settings_widgets(self, parent):
         """Create the settings control widgets."""
@@ -248,12 +288,22 @@ class SettingsDialog:
             spin = ttk.Spinbox(preview_settings_frame, from_=8, to=72, width=10,
                               textvariable=var, command=self._on_setting_changed)
             spin.grid(row=i, column=1, sticky="w", padx=(0, 10))
+        
+        # (variable, LabelSettings field) pairs driving load/read of all settings
+        self._var_map = [(getattr(self, f"{name}_var"), name) for name in _EDITABLE_FIELDS]
     
     def _create_preview_widget(self, parent):
         """Create the preview widget."""
         # Preview canvas
         self.preview_canvas = tk.Canvas(parent, bg="white", width=300, height=400)
         self.preview_canvas.pack(fill="both", expand=True)
+        # Persistent canvas image item (centered on its coords) and the PhotoImage it shows
+        self._img_id = self.preview_canvas.create_image(0, 0, anchor="center")
+        # Error message, shown only while the preview cannot be rendered
+        self._err_item = self.preview_canvas.create_text(
+            150, 200, text="Preview Error", fill="red", state="hidden"
+        )
+        self._tk_img = None
         
         # Sample data for preview
         self.preview_data = {
@@ -264,126 +314,155 @@ class SettingsDialog:
         }
     
     def _on_setting_changed(self):
-        """Called when any setting is changed - updates preview."""
-        self._update_preview()
+        """Called when any setting is changed - schedules a preview update.
+
+        Rapid arrow clicks and keystrokes are coalesced into a single render.
+        """
+        if self._loading:
+            return  # bulk load renders once when it finishes
+        if self._pending_preview is not None:
+            self.dialog.after_cancel(self._pending_preview)
+        self._pending_preview = self.dialog.after(_PREVIEW_DEBOUNCE_MS, self._do_update_preview)
+    
+    def _on_key_release(self, event):
+        if isinstance(event.widget, ttk.Spinbox):
+            self._on_setting_changed()
     
-    def _update_preview(self):
-        """Update the preview with current settings."""
+    def _do_update_preview(self):
+        """Start rendering the preview for the current settings."""
+        if self._pending_preview is not None:
+            self.dialog.after_cancel(self._pending_preview)
+            self._pending_preview = None
+        if not self.dialog.winfo_exists():
+            return  # dialog closed while an update was pending
         try:
             # Get current settings from widgets
             settings = self._get_current_settings_from_widgets()
             
             # Get label dimensions
-            dims = get_label_size_dots(self.label_size)
+            width_dots, height_dots = get_label_size_dots(self.label_size)
             
-            # Render preview
-            img = render_label_preview(
-                width_dots=dims["width_dots"],
-                height_dots=dims["height_dots"],
-                title=self.preview_data["title"],
-                item_number=self.preview_data["item_number"],
-                casepack=self.preview_data["casepack"],
-                upc12=self.preview_data["upc12"]
-            )
-            
-            # Convert to Tkinter image
-            tk_img = image_to_tk(img)
-            
-            # Update canvas
-            self.preview_canvas.delete("all")
-            
-            # Scale image to fit canvas
             canvas_width = self.preview_canvas.winfo_width()
             canvas_height = self.preview_canvas.winfo_height()
             
             if canvas_width > 1 and canvas_height > 1:
-                # Calculate scale to fit
-                scale_x = canvas_width / img.width
-                scale_y = canvas_height / img.height
-                scale = min(scale_x, scale_y, 1.0)  # Don't scale up
-                
-                new_width = int(img.width * scale)
-                new_height = int(img.height * scale)
-                
-                # Resize image
-                img_resized = img.resize((new_width, new_height))
-                tk_img = image_to_tk(img_resized)
-                
-                # Center image
-                x = (canvas_width - new_width) // 2
-                y = (canvas_height - new_height) // 2
-                
-                self.preview_canvas.create_image(x, y, anchor="nw", image=tk_img)
-                self.preview_canvas.image = tk_img  # Keep reference
+                # Only the newest render matters; drop one that has not started yet
+                if self._preview_future is not None:
+                    self._preview_future.cancel()
+                # Render straight at the size that fits the canvas (never scaled
+                # up); memoized per settings + sample data, so treat as read-only
+                self._preview_future = self._executor.submit(
+                    render_label_preview,
+                    width_dots=width_dots,
+                    height_dots=height_dots,
+                    title=self.preview_data["title"],
+                    item_number=self.preview_data["item_number"],
+                    casepack=self.preview_data["casepack"],
+                    upc12=self.preview_data["upc12"],
+                    settings=settings,
+                    target_width=canvas_width,
+                    target_height=canvas_height,
+                )
+                if self._poll_job is not None:
+                    self.dialog.after_cancel(self._poll_job)
+                self._poll_job = self.dialog.after(
+                    _PREVIEW_POLL_MS, self._install_preview, self._preview_future, canvas_width, canvas_height
+                )
+        
+        except Exception as e:
+            self._show_preview_error(e)
+    
+    def _install_preview(self, future: Future, canvas_width: int, canvas_height: int):
+        """Show a finished render on the canvas (Tk thread only)."""
+        self._poll_job = None
+        if future is not self._preview_future:
+            return  # superseded by a newer render
+        if not future.done():
+            self._poll_job = self.dialog.after(
+                _PREVIEW_POLL_MS, self._install_preview, future, canvas_width, canvas_height
+            )
+            return
+        self._preview_future = None
+        try:
+            img = future.result()
+            
+            # Reuses the shown PhotoImage when the size is unchanged
+            self._tk_img = image_to_tk(img, self._tk_img)
+            
+            self.preview_canvas.itemconfig(self._err_item, state="hidden")
+            self.preview_canvas.coords(self._img_id, canvas_width // 2, canvas_height // 2)
+            self.preview_canvas.itemconfig(self._img_id, image=self._tk_img)
+            self.preview_canvas.image = self._tk_img  # Keep reference
         
         except Exception as e:
-            logger.error(f"Failed to update preview: {e}")
-            self.preview_canvas.delete("all")
-            self.preview_canvas.create_text(150, 200, text="Preview Error", fill="red")
+            self._show_preview_error(e)
+    
+    def _show_preview_error(self, e: Exception):
+        logger.error(f"Failed to update preview: {e}")
+        # An older render finishing later must not replace the error
+        if self._preview_future is not None:
+            self._preview_future.cancel()
+            self._preview_future = None
+        # Blank the image item rather than tearing down every canvas item
+        self.preview_canvas.itemconfig(self._img_id, image="")
+        self.preview_canvas.itemconfig(self._err_item, state="normal")
     
     def _get_current_settings_from_widgets(self) -> LabelSettings:
         """Get current settings from all widgets."""
         return LabelSettings(
-            title_font=self.title_font_var.get(),
-            text_font=self.text_font_var.get(),
             title_xy_mul_x=1,  # Fixed
-            title_xy_mul_y=self.title_xy_mul_y_var.get(),
-            x_margin=self.x_margin_var.get(),
-            title_y=self.title_y_var.get(),
-            item_y=self.item_y_var.get(),
-            case_y=self.case_y_var.get(),
-            barcode_y=self.barcode_y_var.get(),
-            line_spacing=self.line_spacing_var.get(),
-            title_max_chars=self.title_max_chars_var.get(),
-            item_max_chars=self.item_max_chars_var.get(),
-            case_max_chars=self.case_max_chars_var.get(),
-            max_title_lines=self.max_title_lines_var.get(),
-            show_separator=self.show_separator_var.get(),
-            separator_width=self.separator_width_var.get(),
             separator_thickness=2,  # Fixed
-            barcode_height=self.barcode_height_var.get(),
-            barcode_narrow=self.barcode_narrow_var.get(),
-            barcode_wide=self.barcode_wide_var.get(),
-            barcode_hri=self.barcode_hri_var.get(),
-            orientation=self.orientation_var.get(),
-            preview_title_font_size=self.preview_title_font_size_var.get(),
-            preview_text_font_size=self.preview_text_font_size_var.get()
+            **{name: var.get() for var, name in self._var_map},
         )
     
     def _reset_to_default(self):
-        """Reset settings to default."""
-        if messagebox.askyesno("Reset Settings", 
-                              "Are you sure you want to reset all settings to default?"):
-            self.current_settings = self.settings_manager.reset_to_default(
-                self.printer_name, self.label_size)
-            self._load_settings_to_widgets()
-            self._update_preview()
+        """Load the default settings into the widgets.
+
+        Nothing is saved until Apply/OK, so Cancel still discards the reset.
+        """
+        try:
+            shown = self._get_current_settings_from_widgets()
+        except tk.TclError:
+            shown = self.current_settings  # a field holds an invalid value
+        self._undo_stack.append(shown)
+        self._load_settings_to_widgets(
+            self.settings_manager.get_default_settings(self.label_size))
+        self._show_undo_toast()
+    
+    def _undo_reset(self):
+        """Put back the widget values from before the last reset."""
+        if not self._undo_stack:
+            return
+        self._load_settings_to_widgets(self._undo_stack.pop())
+        if not self._undo_stack:
+            self._hide_undo_toast()
+    
+    def _show_undo_toast(self):
+        self._toast.grid()
+        if self._toast_job is not None:
+            self.dialog.after_cancel(self._toast_job)
+        self._toast_job = self.dialog.after(_UNDO_TOAST_MS, self._hide_undo_toast)
     
-    def _load_settings_to_widgets(self):
-        """Load current settings into widgets."""
-        # Update all widget variables
-        self.title_font_var.set(self.current_settings.title_font)
-        self.text_font_var.set(self.current_settings.text_font)
-        self.title_xy_mul_y_var.set(self.current_settings.title_xy_mul_y)
-        self.x_margin_var.set(self.current_settings.x_margin)
-        self.title_y_var.set(self.current_settings.title_y)
-        self.item_y_var.set(self.current_settings.item_y)
-        self.case_y_var.set(self.current_settings.case_y)
-        self.barcode_y_var.set(self.current_settings.barcode_y)
-        self.line_spacing_var.set(self.current_settings.line_spacing)
-        self.title_max_chars_var.set(self.current_settings.title_max_chars)
-        self.item_max_chars_var.set(self.current_settings.item_max_chars)
-        self.case_max_chars_var.set(self.current_settings.case_max_chars)
-        self.max_title_lines_var.set(self.current_settings.max_title_lines)
-        self.show_separator_var.set(self.current_settings.show_separator)
-        self.separator_width_var.set(self.current_settings.separator_width)
-        self.barcode_height_var.set(self.current_settings.barcode_height)
-        self.barcode_narrow_var.set(self.current_settings.barcode_narrow)
-        self.barcode_wide_var.set(self.current_settings.barcode_wide)
-        self.barcode_hri_var.set(self.current_settings.barcode_hri)
-        self.orientation_var.set(self.current_settings.orientation)
-        self.preview_title_font_size_var.set(self.current_settings.preview_title_font_size)
-        self.preview_text_font_size_var.set(self.current_settings.preview_text_font_size)
+    def _hide_undo_toast(self):
+        if self._toast_job is not None:
+            self.dialog.after_cancel(self._toast_job)
+            self._toast_job = None
+        self._undo_stack.clear()
+        if self.dialog.winfo_exists():
+            self._toast.grid_remove()
+    
+    def _load_settings_to_widgets(self, settings: Optional[LabelSettings] = None):
+        """Load settings (default: current settings) into widgets, then render the preview once."""
+        if settings is None:
+            settings = self.current_settings
+        self._loading = True
+        try:
+            # Update all widget variables
+            for var, name in self._var_map:
+                var.set(getattr(settings, name))
+        finally:
+            self._loading = False
+        self._do_update_preview()
     
     def _apply(self):
         """Apply current settings."""
@@ -401,6 +480,16 @@ class SettingsDialog:
             logger.error(f"Failed to apply settings: {e}")
             messagebox.showerror("Error", f"Failed to apply settings: {e}")
     
+    def _on_destroy(self, event):
+        # <Destroy> also fires for every child widget
+        if event.widget is self.dialog:
+            # Pending after() callbacks would fire into destroyed Tcl commands
+            for job in (self._toast_job, self._pending_preview, self._poll_job):
+                if job is not None:
+                    self.dialog.after_cancel(job)
+            self._toast_job = self._pending_preview = self._poll_job = None
+            self._executor.shutdown(wait=False, cancel_futures=True)
+    
     def _ok(self):
         """Apply settings and close dialog."""
         self._apply()
@@ -2,18 +2,34 @@
 import sqlite3
 import json
 import os
-from typing import List, Dict, Optional
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+# Shared SQL text so single and bulk saves reuse the connection's cached statement
+_INSERT_ITEM_SQL = """
+    INSERT INTO saved_items (item_number, upc, title, casepack)
+    VALUES (?, ?, ?, ?)
+"""
 
 
 class LabelDatabase:
     def __init__(self, db_path: str = "data/labels.db"):
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
         self.db_path = db_path
+        # One connection for the app's lifetime instead of one per call
+        self._conn = sqlite3.connect(db_path)
+        self._conn.row_factory = sqlite3.Row
+        # WAL lets commits skip most fsyncs; NORMAL is durable enough for UI state
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
         self._init_db()
 
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
     def _init_db(self):
         """Initialize database tables."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn as conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS saved_items (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -34,49 +50,80 @@ class LabelDatabase:
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
-            conn.commit()
+            
+            # Item lookups (update/delete) and the newest-first listing
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_item_number ON saved_items(item_number)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_created_at ON saved_items(created_at DESC)")
 
     def save_item(self, item_number: str, upc: str = "", title: str = "", casepack: str = "") -> bool:
         """Save an item to the database."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
-                    INSERT INTO saved_items (item_number, upc, title, casepack)
-                    VALUES (?, ?, ?, ?)
-                """, (item_number, upc, title, casepack))
-                conn.commit()
+            with self._conn as conn:
+                conn.execute(_INSERT_ITEM_SQL, (item_number, upc, title, casepack))
+            return True
+        except Exception:
+            return False
+
+    def save_items_bulk(self, rows: Iterable[Tuple[str, str, str, str]]) -> bool:
+        """Save many (item_number, upc, title, casepack) rows in one transaction."""
+        try:
+            with self._conn as conn:
+                conn.executemany(_INSERT_ITEM_SQL, rows)
             return True
         except Exception:
             return False
 
-    def get_saved_items(self) -> List[Dict]:
-        """Get all saved items."""
+    def get_saved_items(self) -> Iterator[Dict]:
+        """Yield all saved items, newest first.
+
+        Rows are streamed from the cursor; wrap in list() if you need one.
+        """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            cursor = self._conn.execute("""
+                SELECT item_number,
+                       COALESCE(upc, '') AS upc,
+                       COALESCE(title, '') AS title,
+                       COALESCE(casepack, '') AS casepack,
+                       created_at
+                FROM saved_items
+                ORDER BY created_at DESC
+            """)
+            for row in cursor:
+                yield dict(row)
+        except Exception:
+            return
+
+    def update_item(self, old_item_number: str, item_number: str, upc: str = "", title: str = "", casepack: str = "") -> bool:
+        """Replace an item's fields in a single transaction.
+
+        The item is re-stamped so it moves to the top of the list, as a
+        freshly saved item would. Duplicate rows of the old item collapse
+        into the one edited row. Inserts it if the old item is gone.
+        """
+        try:
+            with self._conn as conn:
+                # Keep only the newest row of the old item, then edit that one
+                conn.execute("""
+                    DELETE FROM saved_items
+                    WHERE item_number = ?
+                      AND id < (SELECT MAX(id) FROM saved_items WHERE item_number = ?)
+                """, (old_item_number, old_item_number))
                 cursor = conn.execute("""
-                    SELECT item_number, upc, title, casepack, created_at
-                    FROM saved_items
-                    ORDER BY created_at DESC
-                """)
-                return [
-                    {
-                        "item_number": row[0],
-                        "upc": row[1] or "",
-                        "title": row[2] or "",
-                        "casepack": row[3] or "",
-                        "created_at": row[4]
-                    }
-                    for row in cursor.fetchall()
-                ]
+                    UPDATE saved_items
+                    SET item_number = ?, upc = ?, title = ?, casepack = ?, created_at = CURRENT_TIMESTAMP
+                    WHERE item_number = ?
+                """, (item_number, upc, title, casepack, old_item_number))
+                if cursor.rowcount == 0:
+                    conn.execute(_INSERT_ITEM_SQL, (item_number, upc, title, casepack))
+            return True
         except Exception:
-            return []
+            return False
 
     def delete_item(self, item_number: str) -> bool:
         """Delete an item from the database."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._conn as conn:
                 conn.execute("DELETE FROM saved_items WHERE item_number = ?", (item_number,))
-                conn.commit()
             return True
         except Exception:
             return False
@@ -84,12 +131,11 @@ class LabelDatabase:
     def save_printer_settings(self, printer_name: str, language: str, size: str) -> bool:
         """Save printer settings."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._conn as conn:
                 conn.execute("""
                     INSERT OR REPLACE INTO printer_settings (id, printer_name, language, size, updated_at)
                     VALUES (1, ?, ?, ?, CURRENT_TIMESTAMP)
                 """, (printer_name, language, size))
-                conn.commit()
             return True
         except Exception:
             return False
@@ -97,7 +143,7 @@ class LabelDatabase:
     def get_printer_settings(self) -> Optional[Dict]:
         """Get saved printer settings."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._conn as conn:
                 cursor = conn.execute("""
                     SELECT printer_name, language, size
                     FROM printer_settings
@@ -2,9 +2,9 @@
 
 Renders a raster preview of the label at 203 dpi for display in Tkinter.
 """
-from typing import Tuple, Optional
+from typing import Optional
 from PIL import Image, ImageDraw, ImageFont
-import io
+import functools
 import logging
 
 try:
@@ -14,45 +14,131 @@ try:
 except Exception:
     HAS_BARCODE = False
 
+from app.labels.text import wrap_text
 from app.utils.settings import LabelSettings
 
 
+# Arial Narrow first, fallback to Arial, then Pillow's default font
+_FONT_CANDIDATES = ("arialn.ttf", "arial.ttf")
+
+
+@functools.lru_cache(maxsize=1)
+def _font_file() -> Optional[str]:
+    """Return the first preview font that FreeType can open, or None.
+
+    Resolved once so loading a new size doesn't retry missing fonts.
+    """
+    for name in _FONT_CANDIDATES:
+        try:
+            ImageFont.truetype(name, 10)
+            return name
+        except Exception:
+            continue
+    return None
+
+
+@functools.lru_cache(maxsize=16)
 def _load_font(size: int) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
-    try:
-        # Try Arial Narrow first, fallback to Arial, then default
+    """Load the preview font at the given size (parsed once per size)."""
+    name = _font_file()
+    if name is not None:
         try:
-            return ImageFont.truetype("arialn.ttf", size)  # Arial Narrow
+            return ImageFont.truetype(name, size)
         except Exception:
-            return ImageFont.truetype("arial.ttf", size)  # Regular Arial
-    except Exception:
-        return ImageFont.load_default()
+            pass
+    return ImageFont.load_default()
 
 
-def wrap_text(text: str, max_chars: int, max_lines: int = 2) -> list[str]:
-    """Wrap text to multiple lines if needed."""
-    if not text:
-        return [""]
-    if len(text) <= max_chars:
-        return [text]
-    
-    words = text.split()
-    lines = []
-    current_line = ""
-    
-    for word in words:
-        if len(current_line + " " + word) <= max_chars:
-            current_line += (" " + word) if current_line else word
-        else:
-            if current_line:
-                lines.append(current_line)
-            current_line = word
-    
-    if current_line:
-        lines.append(current_line)
-    
-    return lines[:max_lines]  # Respect max_lines parameter
+# Barcode geometry in mm, as python-barcode's ImageWriter measures it
+_BARCODE_MODULE_WIDTH_MM = 0.8
+_BARCODE_QUIET_ZONE_MM = 1.0
+_UPC_MODULES = 95
+_UPC_WIDTH_MM = 2 * _BARCODE_QUIET_ZONE_MM + _UPC_MODULES * _BARCODE_MODULE_WIDTH_MM
+_BARCODE_WRITER_DPI = 300  # ImageWriter's default
+_MIN_MODULE_PX = 2
 
 
+def _render_upc_barcode(upc12: str, module_height: int, font_size: int, dpi: float) -> Image.Image:
+    """Render the grayscale UPC-A barcode bitmap for a 12-digit UPC at the given dpi."""
+    try:
+        cls = barcode.get_barcode_class("upc")
+    except Exception:
+        cls = barcode.get_barcode_class("upca")
+
+    payload11 = upc12[:-1]
+    # Draw straight into a grayscale image so no RGB->L conversion is needed
+    bc = cls(payload11, writer=ImageWriter(mode="L"))
+    return bc.render(writer_options={
+        "module_width": _BARCODE_MODULE_WIDTH_MM,
+        "module_height": module_height,
+        "quiet_zone": _BARCODE_QUIET_ZONE_MM,
+        "write_text": True,
+        "font_size": font_size,
+        "text_distance": 2,
+        "dpi": dpi,
+    })
+
+
+# Few entries: a 4x6 barcode is several MB, and finished previews that
+# contain it are cached by render_label_preview anyway
+@functools.lru_cache(maxsize=4)
+def _fitted_upc_barcode(
+    upc12: str, module_height: int, font_size: int, max_w: int, scale: float
+) -> Image.Image:
+    """Return the grayscale barcode ready to paste into a preview.
+
+    The barcode is shrunk to fit max_w label dots (never enlarged), then
+    scaled to the preview scale. The shrink is done by lowering the
+    writer's dpi, so it is rasterized at its final size with no resize.
+    The dpi is rounded down so every module is a whole number of pixels,
+    keeping all bars of a width equally wide. The floor is 2 px per
+    module: ImageWriter cannot draw 1 px bars (its rectangles end 1 px
+    short).
+    Cached because barcode rendering is the most expensive step of a
+    preview; treat the result as read-only.
+    """
+    full_width = _UPC_WIDTH_MM * _BARCODE_WRITER_DPI / 25.4
+    fit = min(1.0, max_w / full_width) * scale
+    module_px = max(_MIN_MODULE_PX, int(_BARCODE_MODULE_WIDTH_MM * _BARCODE_WRITER_DPI * fit / 25.4))
+    dpi = module_px * 25.4 / _BARCODE_MODULE_WIDTH_MM
+    return _render_upc_barcode(upc12, module_height, font_size, dpi)
+
+
+# Preview layouts used when no settings are given (only the preview and
+# layout fields are read)
+_SMALL_LABEL_LAYOUT = LabelSettings(
+    preview_title_font_size=24,
+    preview_text_font_size=22,
+    title_y=10,
+    item_y=44,
+    case_y=70,
+    barcode_y=92,
+    x_margin=20,
+    barcode_height=60,
+    line_spacing=24,
+    title_max_chars=24,
+    max_title_lines=2,
+    show_separator=True,
+    separator_width=200,
+)
+_LARGE_LABEL_LAYOUT = LabelSettings(
+    preview_title_font_size=28,
+    preview_text_font_size=32,
+    title_y=40,
+    item_y=110,
+    case_y=160,
+    barcode_y=210,
+    x_margin=40,
+    barcode_height=280,
+    line_spacing=24,
+    title_max_chars=24,
+    max_title_lines=2,
+    show_separator=True,
+    separator_width=200,
+)
+
+
+@functools.lru_cache(maxsize=32)
 def render_label_preview(
     *,
     width_dots: int,
@@ -62,122 +148,106 @@ def render_label_preview(
     casepack: str,
     upc12: str,
     settings: Optional[LabelSettings] = None,
+    target_width: Optional[int] = None,
+    target_height: Optional[int] = None,
 ) -> Image.Image:
-    img = Image.new("L", (width_dots, height_dots), color=255)
+    """Render a preview image of the label.
+
+    With a target size, the label is drawn directly at the largest scale
+    that fits it (never enlarged) instead of at 203 dpi, so no resize of
+    the finished image is needed.
+
+    Results are cached per argument set and shared between callers, so the
+    returned image must be treated as read-only (resize/copy it instead).
+    """
+    scale = 1.0
+    if target_width and target_height:
+        scale = min(target_width / width_dots, target_height / height_dots, 1.0)
+
+    def px(value: float) -> int:
+        """Convert label dots to preview pixels."""
+        return int(round(value * scale))
+
+    img = Image.new("L", (max(1, px(width_dots)), max(1, px(height_dots))), color=255)
     draw = ImageDraw.Draw(img)
 
-    # Use provided settings or defaults
-    if settings:
-        title_font = _load_font(settings.preview_title_font_size)
-        text_font = _load_font(settings.preview_text_font_size)
-        title_y = settings.title_y
-        item_y = settings.item_y
-        case_y = settings.case_y
-        barcode_y = settings.barcode_y
-        x_margin = settings.x_margin
-        barcode_height = settings.barcode_height
-        font_size = 14 if height_dots <= 203 else 20
-        line_spacing = settings.line_spacing
-        title_max_chars = settings.title_max_chars
-        max_title_lines = settings.max_title_lines
-        show_separator = settings.show_separator
-        separator_width = settings.separator_width
-    else:
-        # Default layout heuristics
-        if height_dots <= 203:  # ~2x1
-            title_font = _load_font(24)
-            text_font = _load_font(22)
-            title_y = 10
-            item_y = 44
-            case_y = 70
-            barcode_y = 92
-            x_margin = 20
-            barcode_height = 60
-            font_size = 14
-            line_spacing = 24
-            title_max_chars = 24
-            max_title_lines = 2
-            show_separator = True
-            separator_width = 200
-        else:
-            title_font = _load_font(28)
-            text_font = _load_font(32)
-            title_y = 40
-            item_y = 110
-            case_y = 160
-            barcode_y = 210
-            x_margin = 40
-            barcode_height = 280
-            font_size = 20
-            line_spacing = 24
-            title_max_chars = 24
-            max_title_lines = 2
-            show_separator = True
-            separator_width = 200
+    # Use provided settings or the default layout for the label size
+    small = height_dots <= 203  # ~2x1
+    layout = settings or (_SMALL_LABEL_LAYOUT if small else _LARGE_LABEL_LAYOUT)
+    title_font_size = layout.preview_title_font_size
+    text_font_size = layout.preview_text_font_size
+    title_y = layout.title_y
+    item_y = layout.item_y
+    case_y = layout.case_y
+    barcode_y = layout.barcode_y
+    x_margin = layout.x_margin
+    barcode_height = layout.barcode_height
+    font_size = 14 if small else 20  # barcode digits, in points
+    line_spacing = layout.line_spacing
+    title_max_chars = layout.title_max_chars
+    max_title_lines = layout.max_title_lines
+    show_separator = layout.show_separator
+    separator_width = layout.separator_width
+
+    title_font = _load_font(max(1, px(title_font_size)))
+    text_font = _load_font(max(1, px(text_font_size)))
 
     # Text with multi-line title support
     title_lines = wrap_text(title or "", title_max_chars, max_title_lines)
     for i, title_line in enumerate(title_lines):
         y_pos = title_y + (i * line_spacing)
-        draw.text((x_margin, y_pos), title_line, fill=0, font=title_font)
+        draw.text((px(x_margin), px(y_pos)), title_line, fill=0, font=title_font)
     
+    # Everything below the title moves down for extra title lines and the separator
+    has_separator = show_separator and title_lines and title_lines[0]
+    y_shift = (len(title_lines) - 1) * line_spacing
+    if has_separator:
+        y_shift += line_spacing  # Extra space after separator
+
     # Add separator line after title (if enabled)
-    if show_separator and title_lines and title_lines[0]:
-        separator_y = title_y + (len(title_lines) * line_spacing) + line_spacing
-        draw.line([(x_margin, separator_y), (x_margin + separator_width, separator_y)], fill=0, width=2)
+    if has_separator:
+        separator_y = px(title_y + (len(title_lines) * line_spacing) + line_spacing)
+        draw.line(
+            [(px(x_margin), separator_y), (px(x_margin + separator_width), separator_y)],
+            fill=0,
+            width=max(1, px(2)),
+        )
     
-    # Adjust positions for multi-line title
-    item_y_adjusted = item_y + (len(title_lines) - 1) * line_spacing
-    if show_separator and title_lines and title_lines[0]:
-        item_y_adjusted += line_spacing  # Extra space after separator
-    draw.text((x_margin, item_y_adjusted), item_number or "", fill=0, font=text_font)
+    draw.text((px(x_margin), px(item_y + y_shift)), item_number or "", fill=0, font=text_font)
     
     if casepack:
-        case_y_adjusted = case_y + (len(title_lines) - 1) * line_spacing
-        if show_separator and title_lines and title_lines[0]:
-            case_y_adjusted += line_spacing  # Extra space after separator
-        draw.text((x_margin, case_y_adjusted), f"CS/PK: {casepack}", fill=0, font=text_font)
+        draw.text((px(x_margin), px(case_y + y_shift)), f"CS/PK: {casepack}", fill=0, font=text_font)
 
     # Barcode (only if UPC provided)
-    if HAS_BARCODE and upc12 and upc12.isdigit() and len(upc12) == 12:
+    # isascii() first: isdigit() alone also accepts non-ASCII digits
+    if HAS_BARCODE and upc12 and upc12.isascii() and upc12.isdigit() and len(upc12) == 12:
         try:
-            try:
-                cls = barcode.get_barcode_class("upc")
-            except Exception:
-                cls = barcode.get_barcode_class("upca")
-
-            payload11 = upc12[:-1]
-            bc = cls(payload11, writer=ImageWriter())
-            bc_img = bc.render(writer_options={
-                "module_width": 0.8,
-                "module_height": barcode_height,
-                "quiet_zone": 1.0,
-                "write_text": True,
-                "font_size": font_size,
-                "text_distance": 2,
-            })
-            # Scale barcode to fit within the label width minus margins (only downscale)
+            # Fit within the label width minus margins
             max_w = max(10, width_dots - (x_margin * 2))
-            if bc_img.width > max_w:
-                scale = max_w / bc_img.width
-                new_size = (int(bc_img.width * scale), int(bc_img.height * scale))
-                bc_img = bc_img.resize(new_size)
-            barcode_y_adjusted = barcode_y + (len(title_lines) - 1) * line_spacing
-            if show_separator and title_lines and title_lines[0]:
-                barcode_y_adjusted += line_spacing  # Extra space after separator
-            img.paste(bc_img.convert("L"), (x_margin, barcode_y_adjusted))
+            bc_img = _fitted_upc_barcode(upc12, barcode_height, font_size, max_w, scale)
+            img.paste(bc_img, (px(x_margin), px(barcode_y + y_shift)))
         except Exception:
             logging.warning("Failed to render preview barcode", exc_info=True)
     else:
         if upc12 and upc12.strip():  # Only show message if UPC was entered but invalid
-            barcode_y_adjusted = barcode_y + (len(title_lines) - 1) * line_spacing
-            if show_separator and title_lines and title_lines[0]:
-                barcode_y_adjusted += line_spacing  # Extra space after separator
-            draw.text((x_margin, barcode_y_adjusted), "UPC preview unavailable", fill=0, font=_load_font(16))
+            draw.text(
+                (px(x_margin), px(barcode_y + y_shift)),
+                "UPC preview unavailable",
+                fill=0,
+                font=_load_font(max(1, px(16))),
+            )
 
     return img
 
 
-def image_to_tk(img: Image.Image):
+def image_to_tk(img: Image.Image, photo=None):
+    """Return a Tk PhotoImage showing img.
+
+    If photo is an ImageTk.PhotoImage of the same size, the pixels are
+    pasted into it and it is returned, instead of allocating a new one.
+    """
     from PIL import ImageTk
+    if photo is not None and (photo.width(), photo.height()) == img.size:
+        photo.paste(img)
+        return photo
     return ImageTk.PhotoImage(img)
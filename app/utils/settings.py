@@ -1,14 +1,24 @@
 """Settings management for label configuration."""
 import json
 import os
+import threading
 from typing import Dict, Any, Optional
 from dataclasses import dataclass, asdict
 import logging
 
+try:
+    import orjson  # type: ignore
+    HAS_ORJSON = True
+except Exception:
+    HAS_ORJSON = False
+
 logger = logging.getLogger(__name__)
 
+# Saves within this window of each other are coalesced into one file write
+SAVE_DEBOUNCE_SECONDS = 0.25
+
 
-@dataclass
+@dataclass(frozen=True)
 class LabelSettings:
     """Settings for a specific label size and printer combination."""
     
@@ -57,6 +67,17 @@ class SettingsManager:
     def __init__(self, db_path: str = "label_settings.json"):
         self.db_path = db_path
         self.settings_cache: Dict[str, LabelSettings] = {}
+        # Guards settings_cache against the debounced writer thread; held
+        # only for in-memory work, never across file I/O
+        self._lock = threading.Lock()
+        self._save_timer: Optional[threading.Timer] = None
+        # Bumped on every cache change; lets the writer skip stale snapshots
+        self._generation = 0
+        # Serializes file writes (timer thread vs flush())
+        self._write_lock = threading.Lock()
+        self._written_generation = 0
+        # Data as last written to (or read from) disk, to skip no-op writes
+        self._saved_snapshot: Optional[Dict[str, Dict[str, Any]]] = None
         self._load_settings()
     
     def _get_settings_key(self, printer_name: str, label_size: str) -> str:
@@ -124,18 +145,41 @@ class SettingsManager:
         """Get settings for a specific printer and label size."""
         key = self._get_settings_key(printer_name, label_size)
         
-        if key not in self.settings_cache:
-            # Load from file or use defaults
-            self.settings_cache[key] = self._load_printer_settings(printer_name, label_size)
-        
-        return self.settings_cache[key]
+        with self._lock:
+            if key not in self.settings_cache:
+                # Load from file or use defaults
+                self.settings_cache[key] = self._load_printer_settings(printer_name, label_size)
+                self._generation += 1
+            return self.settings_cache[key]
     
     def save_settings(self, printer_name: str, label_size: str, settings: LabelSettings) -> None:
-        """Save settings for a specific printer and label size."""
+        """Save settings for a specific printer and label size.
+
+        The cache is updated immediately; the file is written once saves
+        have been idle for SAVE_DEBOUNCE_SECONDS (see flush()).
+        """
         key = self._get_settings_key(printer_name, label_size)
-        self.settings_cache[key] = settings
+        with self._lock:
+            self.settings_cache[key] = settings
+            self._generation += 1
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            # Not a daemon, so a pending write still completes at exit
+            self._save_timer = threading.Timer(SAVE_DEBOUNCE_SECONDS, self._save_all_settings)
+            self._save_timer.start()
+    
+    def flush(self) -> None:
+        """Write any pending settings to disk now."""
+        with self._lock:
+            if self._save_timer is None:
+                return
+            self._save_timer.cancel()
         self._save_all_settings()
     
+    def get_default_settings(self, label_size: str) -> LabelSettings:
+        """Get the default settings for a label size without saving anything."""
+        return self._get_default_settings(label_size)
+    
     def reset_to_default(self, printer_name: str, label_size: str) -> LabelSettings:
         """Reset settings to default for a specific printer and label size."""
         default_settings = self._get_default_settings(label_size)
@@ -148,8 +192,12 @@ class SettingsManager:
             return
         
         try:
-            with open(self.db_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            if HAS_ORJSON:
+                with open(self.db_path, 'rb') as f:
+                    data = orjson.loads(f.read())
+            else:
+                with open(self.db_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
                 
             for key, settings_dict in data.items():
                 try:
@@ -157,37 +205,52 @@ class SettingsManager:
                     self.settings_cache[key] = settings
                 except Exception as e:
                     logger.warning(f"Failed to load settings for {key}: {e}")
+            self._saved_snapshot = data
         except Exception as e:
             logger.error(f"Failed to load settings file: {e}")
     
     def _load_printer_settings(self, printer_name: str, label_size: str) -> LabelSettings:
-        """Load settings for a specific printer from file or return defaults."""
-        if not os.path.exists(self.db_path):
-            return self._get_default_settings(label_size)
-        
-        try:
-            with open(self.db_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            key = self._get_settings_key(printer_name, label_size)
-            if key in data:
-                return LabelSettings(**data[key])
-        except Exception as e:
-            logger.error(f"Failed to load printer settings: {e}")
-        
+        """Return settings for a combination missing from the cache.
+
+        _load_settings already read every saved combination into the cache
+        at startup, so a miss is a new combination and gets the defaults.
+        """
         return self._get_default_settings(label_size)
     
     def _save_all_settings(self) -> None:
-        """Save all settings to file."""
-        try:
-            data = {}
-            for key, settings in self.settings_cache.items():
-                data[key] = asdict(settings)
+        """Save all settings to file.
+
+        Writes a temporary file and swaps it in, so an interrupted write
+        never leaves a truncated settings file behind.
+        """
+        # Copy the entries under the lock; serialize and write outside it so
+        # save_settings on the Tk thread never waits on disk I/O
+        with self._lock:
+            self._save_timer = None
+            items = list(self.settings_cache.items())
+            generation = self._generation
+        data = {key: asdict(settings) for key, settings in items}
+        
+        with self._write_lock:
+            # A newer snapshot has already been written
+            if generation < self._written_generation:
+                return
+            if data == self._saved_snapshot:
+                return
             
-            with open(self.db_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            logger.error(f"Failed to save settings: {e}")
+            tmp_path = self.db_path + ".tmp"
+            try:
+                if HAS_ORJSON:
+                    with open(tmp_path, 'wb') as f:
+                        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+                else:
+                    with open(tmp_path, 'w', encoding='utf-8') as f:
+                        json.dump(data, f, indent=2, ensure_ascii=False)
+                os.replace(tmp_path, self.db_path)
+                self._saved_snapshot = data
+                self._written_generation = generation
+            except Exception as e:
+                logger.error(f"Failed to save settings: {e}")
     
     def get_all_printer_names(self) -> list[str]:
         """Get list of all printer names that have saved settings."""
@@ -1,17 +1,37 @@
 """Validation helpers."""
+import functools
+import operator
+import re
 from typing import Optional
 
+# Bound sub() of a pattern matching anything that is not an ASCII digit
+_NON_DIGIT_SUB = re.compile(r"[^0-9]").sub
+
+# UPC-A weights by position (odd positions weigh 3, even weigh 1)
+_UPC_WEIGHTS = (3, 1) * 6
+# Maps the ASCII digits b"0".."9" to the byte values 0..9
+_DIGIT_VALUES = bytes.maketrans(b"0123456789", bytes(range(10)))
+
+
+def digits_only(value: str) -> str:
+    """Strip everything but the ASCII digits 0-9 from value."""
+    return _NON_DIGIT_SUB("", value)
+
 
 def compute_upc_check_digit(upc11: str) -> str:
-    """Compute the UPC-A 12th check digit for 11-digit payload."""
-    digits = [int(c) for c in upc11]
-    odd_sum = sum(digits[0::2])
-    even_sum = sum(digits[1::2])
-    total = odd_sum * 3 + even_sum
+    """Compute the UPC-A 12th check digit for 11-digit payload.
+
+    Raises ValueError if the payload contains anything but ASCII digits.
+    """
+    if upc11 and not (upc11.isascii() and upc11.isdigit()):
+        raise ValueError(f"UPC payload must be ASCII digits: {upc11!r}")
+    values = upc11.encode("ascii").translate(_DIGIT_VALUES)
+    total = sum(map(operator.mul, values, _UPC_WEIGHTS))
     check = (10 - (total % 10)) % 10
     return str(check)
 
 
+@functools.lru_cache(maxsize=64)
 def ensure_upc12(upc: str) -> Optional[str]:
     """Return a 12-digit UPC-A.
 
@@ -21,7 +41,7 @@ def ensure_upc12(upc: str) -> Optional[str]:
     """
     if upc is None:
         return None
-    clean = "".join([c for c in upc if c.isdigit()])
+    clean = digits_only(upc)
     if len(clean) == 11:
         return clean + compute_upc_check_digit(clean)
     if len(clean) == 12:
@@ -37,7 +57,9 @@ def sanitize_text(value: str, max_len: int = 64) -> str:
     """Limit to ASCII-friendly characters and truncate."""
     if value is None:
         return ""
-    ascii_only = value.encode("ascii", errors="ignore").decode("ascii")
-    if len(ascii_only) <= max_len:
-        return ascii_only
-    return ascii_only[: max_len]
+    # Typical input is already ASCII; only round-trip through bytes when not
+    if not value.isascii():
+        value = value.encode("ascii", errors="ignore").decode("ascii")
+    if len(value) <= max_len:
+        return value
+    return value[: max_len]
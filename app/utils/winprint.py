@@ -3,25 +3,55 @@
 This module provides functions to send raw bytes to a Windows printer
 using the Windows spooler APIs via pywin32.
 """
-from typing import Optional
+import time
+from typing import Dict, Optional, Tuple
 import win32print
 
+# Installed printers rarely change, so enumeration results are reused briefly
+PRINTER_CACHE_TTL = 30.0
 
-def list_installed_printers() -> list[str]:
-	"""Return a list of installed printer names."""
+_printer_cache: Dict[str, Tuple[float, object]] = {}
+
+
+def _cached(key: str, fetch):
+	"""Return fetch() through the printer cache, refreshing after the TTL."""
+	now = time.monotonic()
+	entry = _printer_cache.get(key)
+	if entry is not None and now - entry[0] < PRINTER_CACHE_TTL:
+		return entry[1]
+	value = fetch()
+	_printer_cache[key] = (now, value)
+	return value
+
+
+def invalidate_printer_cache() -> None:
+	"""Forget cached printer lists so the next call queries the spooler."""
+	_printer_cache.clear()
+
+
+def _enum_printers() -> Tuple[str, ...]:
 	flags = win32print.PRINTER_ENUM_LOCAL | win32print.PRINTER_ENUM_CONNECTIONS
 	printers = win32print.EnumPrinters(flags)
-	return [p[2] for p in printers]
+	return tuple(p[2] for p in printers)
 
 
-def get_default_printer() -> Optional[str]:
-	"""Return the default printer name, if available."""
+def _default_printer() -> Optional[str]:
 	try:
 		return win32print.GetDefaultPrinter()
 	except win32print.error:
 		return None
 
 
+def list_installed_printers() -> list[str]:
+	"""Return a list of installed printer names (cached for PRINTER_CACHE_TTL seconds)."""
+	return list(_cached("printers", _enum_printers))
+
+
+def get_default_printer() -> Optional[str]:
+	"""Return the default printer name, if available (cached for PRINTER_CACHE_TTL seconds)."""
+	return _cached("default", _default_printer)
+
+
 def send_raw(printer_name: str, data: bytes, job_name: str = "PrintLabel Job") -> None:
 	"""Send raw ZPL/EPL bytes to the given printer.
 